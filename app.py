@@ -1,9 +1,22 @@
 # app.py
 from flask import Flask, request, jsonify
-import os, re, json, requests
-from bs4 import BeautifulSoup
+from flask.json.provider import DefaultJSONProvider
+import os, re, json, asyncio, threading, requests
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml.etree import XPath, ParserError
+from lxml.cssselect import CSSSelector
 import extruct
-from w3lib.html import get_base_url
+import extruct.jsonld
+from extruct.uniform import flatten_dict, infer_context
+import jstyleson  # extruct dependency; its lenient JSON-LD decoder
+from types import SimpleNamespace
 
 # Optional Cloudflare/Akamai bypass
 try:
@@ -11,8 +24,82 @@ try:
 except Exception:
     cloudscraper = None
 
+# Optional fast JSON (C) for JSON-LD decoding and responses
+try:
+    import orjson  # pip install orjson
+except Exception:
+    orjson = None
+
+# Optional brotli so urllib3/aiohttp can decode "br" responses
+try:
+    import brotli  # noqa: F401  # pip install brotli
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except Exception:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# Optional async client for /extract_many
+try:
+    import aiohttp  # pip install aiohttp
+except Exception:
+    aiohttp = None
+
 app = Flask(__name__)
 
+# ------------ JSON ------------
+# orjson before 3.9.15 has no nesting limit and overflows the C stack on
+# deeply nested input; there, blobs with more brackets than its later
+# limit (1024, an upper bound on depth) take the stdlib path
+ORJSON_MAX_NESTING = 1024
+_ORJSON_NESTING_SAFE = orjson is not None and tuple(
+    int(x) for x in re.findall(r"\d+", orjson.__version__)[:3]
+) >= (3, 9, 15)
+
+def _orjson_ok(s):
+    if _ORJSON_NESTING_SAFE:
+        return True
+    lb, lc = ("[", "{") if isinstance(s, str) else (b"[", b"{")
+    return s.count(lb) + s.count(lc) <= ORJSON_MAX_NESTING
+
+def _fast_json_loads(s, **kw):
+    # orjson has no strict=False; blobs with raw control chars take the stdlib path
+    if orjson is not None and _orjson_ok(s):
+        try:
+            return orjson.loads(s)
+        except ValueError:
+            pass
+    return json.loads(s, **kw)
+
+if orjson is not None:
+    # extruct decodes every <script type="application/ld+json"> via json.loads
+    extruct.jsonld.json = SimpleNamespace(loads=_fast_json_loads)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON via orjson, so jsonify() and request.get_json() skip stdlib json."""
+
+    # orjson refuses what stdlib json encodes fine (lone surrogates such as
+    # "\ud83c" kept by the json.loads fallback, ints past 64 bits); on
+    # TypeError hand the object to Flask's stock provider instead
+
+    def dumps(self, obj, **kwargs):
+        try:
+            return orjson.dumps(obj, default=self.default).decode()
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s) if _orjson_ok(s) else super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(obj, default=self.default)
+        except TypeError:
+            return super().response(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
 # ------------ HTTP headers ------------
 DEFAULT_HEADERS = {
     "User-Agent": (
@@ -22,24 +109,84 @@ DEFAULT_HEADERS = {
     ),
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.9",
+    # compressed HTML is 4-6x smaller on the wire; only offer br when we can decode it
+    "Accept-Encoding": ACCEPT_ENCODING,
     "Cache-Control": "no-cache",
     "Pragma": "no-cache",
     "Connection": "keep-alive",
 }
 
+# ------------ Shared HTTP clients ------------
+# One pooled session per process so repeat hosts reuse keep-alive sockets
+# instead of paying a fresh TCP+TLS handshake on every /extract.
+SESSION = requests.Session()
+SESSION.headers.update(DEFAULT_HEADERS)
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    # Retry refused connects and 500/502/504 only. read=0: a host that
+    # accepts and then stalls has already used the whole read timeout, and
+    # retrying it would triple the wait before the next tier gets a turn.
+    # raise_on_status=False hands the last 5xx back to fetch_html's own handling
+    max_retries=Retry(
+        total=2, read=0, backoff_factor=0.3,
+        status_forcelist=(500, 502, 504), raise_on_status=False,
+    ),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+# cloudscraper builds its challenge solver + TLS profile on creation, so
+# keep one per thread rather than one per call. Not one per process: a
+# CloudScraper keeps challenge-loop state (_solveDepthCnt) on itself, so
+# request threads must not share one. It is a requests.Session subclass,
+# so retried hosts also keep their sockets.
+_SCRAPERS = threading.local()
+
+def _cloudscraper():
+    # this thread's scraper, or None when cloudscraper is missing or broken
+    if cloudscraper is None:
+        return None
+    scraper = getattr(_SCRAPERS, "scraper", None)
+    if scraper is None:
+        try:
+            scraper = cloudscraper.create_scraper(browser={"browser": "chrome", "platform": "windows", "mobile": False})
+            # same override the per-call headers=DEFAULT_HEADERS did, merged once
+            scraper.headers.update(DEFAULT_HEADERS)
+        except Exception:
+            return None
+        _SCRAPERS.scraper = scraper
+    return scraper
+
+def _cloudscraper_get(url):
+    # for executor threads, which can't check _cloudscraper() up front
+    scraper = _cloudscraper()
+    if scraper is None:
+        raise Exception("cloudscraper unavailable")
+    return scraper.get(url, timeout=(5, 35), allow_redirects=True)
+
 # ------------ Helpers (original + new) ------------
 def _clean(s):
     if not s:
         return ""
-    return re.sub(r"\s+", " ", str(s)).strip()
+    s = s.strip() if isinstance(s, str) else str(s).strip()
+    # fast path: no double spaces and no tabs/newlines/nbsp (all non-printable)
+    if "  " not in s and s.isprintable():
+        return s
+    # str.split() breaks on the same whitespace set as \s, in one C pass
+    return " ".join(s.split())
 
 def _as_list(x):
     if x is None:
         return []
     if isinstance(x, list):
-        return [_clean(i) for i in x if _clean(i)]
+        return [t for t in map(_clean, x) if t]
     return [_clean(x)]
 
+# Hostile JSON-LD can nest HowToSections arbitrarily deep; stop after this
+# many instruction nodes instead of walking (or recursing) forever
+MAX_INSTRUCTION_NODES = 10_000
+
 def _flatten_instructions(instr):
     """
     Accepts:
@@ -51,86 +198,109 @@ def _flatten_instructions(instr):
     out = []
     if not instr:
         return out
-    if isinstance(instr, str):
-        t = _clean(instr)
-        return [t] if t else []
-    if isinstance(instr, list):
-        for item in instr:
-            if isinstance(item, str):
-                t = _clean(item)
-                if t:
+    # Stack of iterators rather than recursion: a section's children are
+    # walked in full before its parent list resumes, so page order holds.
+    # Values are exact str/list/dict from the JSON decoder or extruct, and
+    # lists nested directly in lists are skipped, as they always were.
+    stack = [iter(instr) if type(instr) is list else iter((instr,))]
+    budget = MAX_INSTRUCTION_NODES
+    while stack:
+        for item in stack[-1]:
+            budget -= 1
+            if budget < 0:
+                return out
+            kind = type(item)
+            if kind is str:
+                if t := _clean(item):
                     out.append(t)
-            elif isinstance(item, dict):
-                t = _clean(item.get("text") or item.get("name"))
-                if t:
+            elif kind is dict:
+                if t := _clean(item.get("text") or item.get("name")):
                     out.append(t)
                 # HowToSection may have "itemListElement"
                 children = item.get("itemListElement")
                 if children:
-                    out.extend(_flatten_instructions(children))
-    elif isinstance(instr, dict):
-        t = _clean(instr.get("text") or instr.get("name"))
-        if t:
-            out.append(t)
-        children = instr.get("itemListElement")
-        if children:
-            out.extend(_flatten_instructions(children))
+                    stack.append(iter(children) if type(children) is list else iter((children,)))
+                    break
+        else:
+            stack.pop()
     return out
 
+# Image values are exact str/list/dict too, so one dict lookup on type()
+# picks the handler instead of walking an isinstance chain.
+def _ignore(*_):
+    return ""
+
+def _img_url(d):
+    return d.get("url") or d.get("@id") or d.get("contentUrl")
+
+def _img_from_list(items):
+    for it in items:
+        if type(it) is str:
+            if t := _clean(it):
+                return t
+        elif type(it) is dict and (url := _img_url(it)):
+            return _clean(url)
+    return ""
+
+_IMG_DISPATCH = {
+    str: _clean,
+    list: _img_from_list,
+    dict: lambda d: _clean(_img_url(d)),
+}
+
 def _pick_image(image_field):
     # image can be str, list[str], dict with url/@id
     if not image_field:
         return ""
-    if isinstance(image_field, str):
-        return _clean(image_field)
-    if isinstance(image_field, list):
-        for it in image_field:
-            if isinstance(it, str) and _clean(it):
-                return _clean(it)
-            if isinstance(it, dict):
-                url = it.get("url") or it.get("@id") or it.get("contentUrl")
-                if url:
-                    return _clean(url)
-        return ""
-    if isinstance(image_field, dict):
-        url = image_field.get("url") or image_field.get("@id") or image_field.get("contentUrl")
-        return _clean(url)
-    return ""
+    return _IMG_DISPATCH.get(type(image_field), _ignore)(image_field)
 
-def _find_recipe_nodes(extruct_data):
+def _is_recipe(obj):
+    if not isinstance(obj, dict):
+        return False
+    t = obj.get("@type")
+    # Exact match covers nearly every page; anything else gets the
+    # case-insensitive comparison
+    if t == "Recipe" or (isinstance(t, list) and "Recipe" in t):
+        return True
+    if not t:
+        return False
+    types = t if isinstance(t, list) else (t,)
+    return any(tt and str(tt).lower() == "recipe" for tt in types)
+
+def _iter_recipe_nodes(extruct_data):
     """
-    Returns list of possible Recipe dicts from various shapes:
+    Yields possible Recipe dicts lazily, in priority order, from various shapes:
     - top-level json-ld items
     - items inside @graph arrays
     - microdata items
+    Callers only need the first, so use next(..., None).
     """
-    candidates = []
-
-    def consider(obj):
-        if not isinstance(obj, dict):
-            return
-        t = obj.get("@type")
-        types = t if isinstance(t, list) else [t]
-        if any(tt and str(tt).lower() == "recipe" for tt in types):
-            candidates.append(obj)
-
     # json-ld
     for item in extruct_data.get("json-ld", []) or []:
         if isinstance(item, dict):
-            consider(item)
+            if _is_recipe(item):
+                yield item
             graph = item.get("@graph")
             if isinstance(graph, list):
                 for g in graph:
-                    consider(g)
+                    if _is_recipe(g):
+                        yield g
         elif isinstance(item, list):
             for it in item:
-                consider(it)
+                if _is_recipe(it):
+                    yield it
 
-    # microdata
+    # microdata, raw (uniform=False): only Recipe items get flattened
     for item in extruct_data.get("microdata", []) or []:
-        consider(item)
+        if isinstance(item, dict) and _is_recipe({"@type": _microdata_type(item)}):
+            yield flatten_dict(item, "http://schema.org", True)
 
-    return candidates
+def _microdata_type(item):
+    # the @type extruct's uniform output would give, without flattening
+    typ = item.get("type")
+    if not typ or isinstance(typ, list):
+        return typ
+    return infer_context(typ)[1]
 
 # ---------- NEW: time & yield utilities ----------
 # Matches "15-20 minutes", "1–2 hrs", "5 min", "90 m", etc.
@@ -139,6 +309,13 @@ TIME_RE = re.compile(
     r"(h|hr|hrs|hour|hours|m|min|mins|minute|minutes)\b",
     re.I,
 )
+DIGITS_RE = re.compile(r"\d+")
+PT_H = re.compile(r"(?<=PT)\d+(?=H)")
+PT_M = re.compile(r"\d+(?=M)")
+PT_S = re.compile(r"\d+(?=S)")
+# "4", "4-6", "4 – 6"
+YIELD_RE = re.compile(r"\d+(?:\s*[-–]\s*\d+)?")
+LEAD_YIELD_RE = re.compile(r"^\s*(\d+(?:\s*[-–]\s*\d+)?)")
 
 def _format_minutes(m):
     try:
@@ -160,14 +337,14 @@ def format_duration(raw):
     s = _clean(raw).upper()
 
     # digits → minutes
-    if re.fullmatch(r"\d+", s):
+    if DIGITS_RE.fullmatch(s):
         return _format_minutes(int(s))
 
     # ISO 8601 PT durations
     if s.startswith("PT"):
-        h = re.search(r"(?<=PT)\d+(?=H)", s)
-        m = re.search(r"\d+(?=M)", s)
-        ss = re.search(r"\d+(?=S)", s)
+        h = PT_H.search(s)
+        m = PT_M.search(s)
+        ss = PT_S.search(s)
         hours = int(h.group(0)) if h else 0
         mins = int(m.group(0)) if m else 0
         # if only seconds, approximate to minutes (min 1)
@@ -194,7 +371,7 @@ def normalize_yield(raw):
     if not raw:
         return None
     s = _clean(str(raw)).lower()
-    m = re.search(r"\d+(?:\s*[-–]\s*\d+)?", s)
+    m = YIELD_RE.search(s)
     return m.group(0).replace(" ", "") if m else s
 
 def derive_cook_from_steps(steps):
@@ -204,27 +381,102 @@ def derive_cook_from_steps(steps):
     if not steps:
         return None
     total = 0
+    finditer = TIME_RE.finditer  # hoisted for the hot loop
     for st in steps:
-        for m in TIME_RE.finditer(st):
+        for m in finditer(st):
             low = int(m.group(1))
             unit = m.group(3).lower()
             total += (low * 60) if unit.startswith("h") else low
     return _format_minutes(total) if total > 0 else None
 
-# ------------ Extract via schema.org first ------------
-def extract_schema_recipe(html, url):
-    base_url = get_base_url(html, url)
-    data = extruct.extract(
-        html,
-        base_url=base_url,
-        syntaxes=["json-ld", "microdata"],
-        uniform=True,
-    )
-    recipes = _find_recipe_nodes(data)
-    if not recipes:
+# ------------ Parse once, share the tree ------------
+# lxml parsers must not be shared across threads; keep one per worker thread
+_PARSERS = threading.local()
+
+def _html_parser():
+    parser = getattr(_PARSERS, "parser", None)
+    if parser is None:
+        parser = _PARSERS.parser = lxml.html.HTMLParser(encoding="utf-8")
+    return parser
+
+def parse_tree(html):
+    """
+    Parse html into one lxml document shared by extruct and the HTML
+    fallback, so a page is tokenized once per request.
+    Returns None for empty/unparseable documents.
+    """
+    if not html:
+        return None
+    # bytes input: lxml rejects str with an <?xml encoding=...?> declaration
+    raw = html.encode("utf-8", "replace") if isinstance(html, str) else html
+    try:
+        return lxml.html.document_fromstring(raw, parser=_html_parser())
+    except (ParserError, ValueError):
         return None
 
-    r = recipes[0]  # take the first match
+# Compiled once; evaluated in libxml2 instead of walking nodes from Python
+_TEXT_XP = XPath(".//text()[not(parent::script) and not(parent::style) and not(ancestor::template)]")
+_ALL_TEXT_XP = XPath("//text()")
+_LIST_AFTER_XP = XPath("(descendant::ul|descendant::ol|following::ul|following::ol)[position() <= 2]")
+
+def _base_url(tree, url):
+    # First <base href> in the document; rare on recipe pages, so usually url.
+    # iter() by tag is near-free when no <base> was parsed (libxml2 never
+    # interned the name), unlike an XPath // walk over every element.
+    for el in tree.iter("base"):
+        href = el.get("href")
+        if href is not None:
+            href = href.strip()
+            return urljoin(url, href) if href else url
+    return url
+
+def _node_text(el):
+    # bs4 get_text(" ", strip=True) equivalent: skips script/style contents
+    return _clean(" ".join(_TEXT_XP(el)))
+
+# ------------ Extract via schema.org first ------------
+# Where comments and raw-text elements start, and where each one ends.
+# Jumping over them whole keeps a <script> inside a comment (never in the
+# DOM) from being read, and a "<!--" inside JS or CSS from opening one.
+# This is a regex scan, not an HTML tokenizer: see _ldjson_blocks.
+RAW_OPEN_RE = re.compile(r"<!--|<(script|style)\b([^>]*)>", re.I)
+RAW_CLOSE_RE = {
+    "script": re.compile(r"</script\s*>", re.I),
+    "style": re.compile(r"</style\s*>", re.I),
+}
+# type="application/ld+json", quoted or bare, as extruct's XPath matches it
+LDJSON_TYPE_RE = re.compile(
+    r"\stype\s*=\s*(?:\"application/ld\+json\"|'application/ld\+json'|application/ld\+json(?=\s|$))",
+    re.I,
+)
+
+def _ldjson_blocks(html):
+    """
+    Best-effort bodies of <script type="application/ld+json"> blocks, in
+    page order. Usually the same blocks extruct's XPath sees, but not
+    always: a ">" inside a quoted attribute ends the tag early; "<script"
+    or "<!--" inside an attribute value or <title>/<textarea> is taken for
+    a real opener and can swallow a later block; <!-->, <!---> and --!>
+    are not treated as comment boundaries. Callers must not read a miss
+    here as a miss for extruct.
+    """
+    pos, search = 0, RAW_OPEN_RE.search
+    while m := search(html, pos):
+        tag = m.group(1)
+        if tag is None:
+            pos = html.find("-->", m.end())
+            if pos < 0:
+                return
+            pos += 3
+            continue
+        close = RAW_CLOSE_RE[tag.lower()].search(html, m.end())
+        if tag.lower() == "script" and LDJSON_TYPE_RE.search(m.group(2)):
+            yield html[m.end():close.start() if close else len(html)]
+        if close is None:
+            return
+        pos = close.end()
+
+def _recipe_from_node(r):
     title = _clean(r.get("name"))
     ingredients = _as_list(r.get("recipeIngredient") or r.get("ingredients"))
     steps = _flatten_instructions(r.get("recipeInstructions"))
@@ -244,26 +496,148 @@ def extract_schema_recipe(html, url):
         return None
     return out
 
+def _decode_ldjson(script):
+    try:
+        return _fast_json_loads(script, strict=False)
+    except ValueError:
+        # same retry extruct makes for leading HTML/JS comment lines
+        return jstyleson.loads(extruct.jsonld.HTML_OR_JS_COMMENTLINE.sub("", script), strict=False)
+
+def scan_jsonld(html):
+    """
+    Quick path: decode <script type="application/ld+json"> blocks straight
+    from the markup, in page order, and stop at the first Recipe. No DOM,
+    no microdata pass. Blocks are decoded exactly as extruct would.
+    Returns (recipe_node, scanned): the first Recipe dict or None, and the
+    block texts decoded on the way (None if one failed). The scan is
+    best-effort; see jsonld_scan_covers before treating a miss as final.
+    """
+    if not isinstance(html, str):
+        return None, None
+    scanned = []
+    for script in _ldjson_blocks(html):
+        try:
+            obj = _decode_ldjson(script)
+        except Exception:  # ValueError, or RecursionError on absurd nesting
+            return None, None
+        scanned.append(script)
+        items = obj if isinstance(obj, list) else [obj]
+        r = next(_iter_recipe_nodes({"json-ld": items}), None)
+        if r is not None:
+            return r, scanned
+    return None, scanned
+
+def jsonld_scan_covers(tree, scanned):
+    """
+    True when a scan_jsonld miss read exactly the ld+json blocks extruct's
+    own XPath finds in tree (same count, same text, same order), so its
+    JSON-LD pass can be skipped.
+    """
+    if scanned is None or tree is None:
+        return False
+    nodes = extruct.jsonld.JsonLdExtractor._xp_jsonld(tree)
+    return len(nodes) == len(scanned) and all(
+        el.xpath("string()") == text for el, text in zip(nodes, scanned)
+    )
+
+def extract_schema_recipe(html, url, tree=None, syntaxes=("json-ld", "microdata")):
+    if tree is None:
+        tree = parse_tree(html)
+    if tree is None:
+        return None
+    data = extruct.extract(
+        tree,
+        base_url=_base_url(tree, url),
+        syntaxes=list(syntaxes),
+        uniform=False,  # _iter_recipe_nodes flattens the winning microdata item itself
+    )
+    r = next(_iter_recipe_nodes(data), None)  # take the first match
+    if r is None:
+        return None
+    return _recipe_from_node(r)
+
 # ------------ HTML fallback if schema.org missing ------------
 INGR_HEADINGS = re.compile(r"\b(ingredients|ingredient list|you(?:’|'|)ll need|what you'll need|shopping list)\b", re.I)
 STEP_HEADINGS = re.compile(r"\b(method|steps?|instructions?|preparation|directions?|how to(?: make)?)\b", re.I)
+# Either heading kind in one search; the named group says which matched first
+HEAD_RE = re.compile(f"(?P<ingr>{INGR_HEADINGS.pattern})|(?P<step>{STEP_HEADINGS.pattern})", re.I)
+# "1. ..." / "2) ..." or a 7+ word paragraph mentioning "step" (text is _clean'ed: single spaces)
+NUM_OR_STEP_RE = re.compile(r"\d+[\.\)]\s+|(?=(?:\S+ ){6}\S).*?\bstep\b", re.I)
+# Cheap superset of NUM_OR_STEP_RE on a <p>'s raw string value, so only
+# paragraphs with a digit or "step" pay for _node_text
+_STEP_CANDIDATES_XP = XPath(
+    r"//p[re:test(., '\d|step', 'i')]",
+    namespaces={"re": "http://exslt.org/regular-expressions"},
+)
+# Class-name guesses, translated from CSS to XPath once at import.
+# [class*=ingredient] already covers .ingredients and .recipe-ingredients.
+INGR_SEL = CSSSelector("[class*=ingredient] li")
+STEPS_SEL = CSSSelector("[class*=method] li, .method__item, .instructions li, .direction li, .directions li")
+# All time/serves labels in one alternation so the page text is scanned once
+LABEL_ALL = re.compile(
+    r"\b(?:(?P<prep>prep)|(?P<cook>cook|cooking)|(?P<total>total|ready\s*in)"
+    r"|(?P<serves>serves?|servings?|yield|makes))\s*:?\s*",
+    re.I,
+)
+
+def _text_parent(t):
+    parent = t.getparent()
+    return parent.getparent() if t.is_tail else parent
+
+def _heading_parents(tree):
+    """
+    One walk over the text nodes for both heading kinds. Returns
+    (ingredients_parent, steps_parent): the element holding the first text
+    matching each pattern, like soup.find(string=...), or None.
+    """
+    ingr = step = None
+    # hoisted: these run once per text node on the page
+    head_search, ingr_search, step_search = HEAD_RE.search, INGR_HEADINGS.search, STEP_HEADINGS.search
+    for t in _ALL_TEXT_XP(tree):
+        if ingr is None and step is None:
+            m = head_search(t)
+            if m is None:
+                continue
+            # the same text may hold both kinds ("Ingredients & Method")
+            if m.lastgroup == "ingr":
+                ingr = _text_parent(t)
+                if step_search(t):
+                    step = ingr
+            else:
+                step = _text_parent(t)
+                if ingr_search(t):
+                    ingr = step
+        elif ingr is None:
+            # one kind found: only the missing pattern is left to test
+            if ingr_search(t):
+                ingr = _text_parent(t)
+        elif step_search(t):
+            step = _text_parent(t)
+        if ingr is not None and step is not None:
+            break
+    return ingr, step
+
+def _title_node(tree):
+    # h1 → h2 → <title> priority in one walk instead of up to three whole-tree finds
+    first = {}
+    for el in tree.iter("h1", "h2", "title"):
+        if el.tag == "h1":
+            return el
+        first.setdefault(el.tag, el)
+    return first.get("h2", first.get("title"))
 
 def _next_list_items(node):
-    # Find the next ul/ol after a heading-like node
-    for sib in node.find_all_next(["ul", "ol"], limit=2):
-        items = [_clean(li.get_text(" ", strip=True)) for li in sib.find_all("li")]
+    # Find the next ul/ol after a heading-like node (descendants included, like find_all_next)
+    for sib in _LIST_AFTER_XP(node):
+        items = [_node_text(li) for li in sib.iter("li")]
         items = [i for i in items if i]
         if items:
             return items
     return []
 
-def _numbered_paragraphs(soup):
-    out = []
-    for p in soup.find_all("p"):
-        txt = _clean(p.get_text(" ", strip=True))
-        if re.match(r"^\d+[\.\)]\s+", txt) or (len(txt.split()) > 6 and re.search(r"\bstep\b", txt.lower())):
-            out.append(txt)
-    return out
+def _numbered_paragraphs(tree):
+    match = NUM_OR_STEP_RE.match
+    return [txt for p in _STEP_CANDIDATES_XP(tree) if (txt := _node_text(p)) and match(txt)]
 
 def _scan_labels_for_times_and_serves(plain_text):
     """
@@ -273,15 +647,11 @@ def _scan_labels_for_times_and_serves(plain_text):
       - Serves/Servings/Yield/Makes: ...
     Return dict with strings (already normalized when possible)
     """
-    t = " ".join(plain_text.split())  # collapse whitespace
-    lower = t.lower()
+    t = _clean(plain_text)  # collapse whitespace; no copy when already clean
 
-    def value_after(label_regex):
-        m = re.search(label_regex, lower, re.I)
-        if not m:
-            return None
+    def value_at(pos):
         # take a short slice after the label
-        slice_ = lower[m.end(): m.end() + 60]
+        slice_ = t[pos: pos + 60]
         # prefer a time phrase
         m_time = TIME_RE.search(slice_)
         if m_time:
@@ -290,15 +660,24 @@ def _scan_labels_for_times_and_serves(plain_text):
             mins = num1 * 60 if unit.startswith("h") else num1
             return _format_minutes(mins)
         # otherwise return an early token (e.g., "4", "4-6")
-        m_yield = re.search(r"^\s*(\d+(?:\s*[-–]\s*\d+)?)", slice_)
+        m_yield = LEAD_YIELD_RE.search(slice_)
         if m_yield:
             return m_yield.group(1).replace(" ", "")
         return None
 
-    prep = value_after(r"\bprep\s*:?\s*")
-    cook = value_after(r"\b(cook|cooking)\s*:?\s*")
-    total = value_after(r"\b(total|ready\s*in)\s*:?\s*")
-    serves = value_after(r"\b(serves?|servings?|yield|makes)\s*:?\s*")
+    # first occurrence of each label wins, as with one search per label
+    found = {}
+    for m in LABEL_ALL.finditer(t):
+        kind = m.lastgroup
+        if kind not in found:
+            found[kind] = value_at(m.end())
+            if len(found) == 4:
+                break
+
+    prep = found.get("prep")
+    cook = found.get("cook")
+    total = found.get("total")
+    serves = found.get("serves")
 
     return {
         "prepTime": prep,
@@ -306,27 +685,33 @@ def _scan_labels_for_times_and_serves(plain_text):
         "recipeYield": serves,
     }
 
-def extract_html_fallback(html):
-    soup = BeautifulSoup(html, "html.parser")
+def extract_html_fallback(html, tree=None):
+    if tree is None:
+        tree = parse_tree(html)
+    if tree is None:
+        return {"title": "", "ingredients": [], "steps": [], "prepTime": None, "cookTime": None, "recipeYield": None}
 
     # Title
-    h = soup.find("h1") or soup.find("h2") or soup.title
-    title = _clean(h.get_text(" ", strip=True) if h else "")
+    h = _title_node(tree)
+    title = _node_text(h) if h is not None else ""
 
     # Ingredients by heading → next list
     ingredients = []
-    hdr = soup.find(string=INGR_HEADINGS)
-    if hdr and hasattr(hdr, "parent"):
-        ingredients = _next_list_items(hdr.parent)
+    hdr, sh = _heading_parents(tree)
+    if hdr is not None:
+        ingredients = _next_list_items(hdr)
 
     # If empty, try common class names
     if not ingredients:
-        guess_lists = soup.select("[class*=ingredient] li, .ingredients li, .recipe-ingredients li")
-        ingredients = [_clean(li.get_text(" ", strip=True)) for li in guess_lists if _clean(li.get_text(" ", strip=True))]
+        guess_lists = INGR_SEL(tree)
+        ingredients = [t for t in (_node_text(li) for li in guess_lists) if t]
     # As an absolute last resort, take first short-ish UL
     if not ingredients:
-        for ul in soup.find_all("ul"):
-            items = [_clean(li.get_text(" ", strip=True)) for li in ul.find_all("li")]
+        for ul in tree.iter("ul"):
+            lis = list(ul.iter("li"))
+            if len(lis) < 4:  # can't reach the 4-item minimum; skip the text work
+                continue
+            items = [_node_text(li) for li in lis]
             items = [i for i in items if 2 <= len(i.split()) <= 25]
             if 4 <= len(items) <= 40:  # heuristics
                 ingredients = items
@@ -334,26 +719,20 @@ def extract_html_fallback(html):
 
     # Steps by heading → next ordered list OR numbered paragraphs
     steps = []
-    sh = soup.find(string=STEP_HEADINGS)
-    if sh and hasattr(sh, "parent"):
-        for sib in sh.parent.find_all_next(["ol", "ul"], limit=2):
-            items = [_clean(li.get_text(" ", strip=True)) for li in sib.find_all("li")]
-            items = [i for i in items if i]
-            if items:
-                steps = items
-                break
+    if sh is not None:
+        steps = _next_list_items(sh)
 
     # If still nothing, try common class names
     if not steps:
-        guess_steps = soup.select("[class*=method] li, .method__item, .instructions li, .direction li, .directions li")
-        steps = [_clean(el.get_text(" ", strip=True)) for el in guess_steps if _clean(el.get_text(" ", strip=True))]
+        guess_steps = STEPS_SEL(tree)
+        steps = [t for t in (_node_text(el) for el in guess_steps) if t]
 
     # Finally, numbered paragraphs
     if not steps:
-        steps = _numbered_paragraphs(soup)
+        steps = _numbered_paragraphs(tree)
 
     # Times/serves from labels across body text
-    labels = _scan_labels_for_times_and_serves(soup.get_text(" ", strip=True))
+    labels = _scan_labels_for_times_and_serves(_node_text(tree))
 
     return {
         "title": title or "",
@@ -364,38 +743,222 @@ def extract_html_fallback(html):
         "recipeYield": labels.get("recipeYield"),
     }
 
-# ------------ Anti-bot aware fetcher (unchanged behavior) ------------
-def fetch_html(url: str):
+# ------------ Known recipe-card plugins ------------
+# WP Recipe Maker, Tasty Recipes and Mediavine Create render cards with
+# fixed class names. When the markup carries one but no schema.org Recipe
+# made it onto the page, read the card directly instead of guessing with
+# the heuristics.
+CARD_MARKER_RE = re.compile(r"wprm-recipe-container|tasty-recipes|mv-create-card")
+# marker -> (card, title, ingredients, steps), all relative to the card
+CARD_TEMPLATES = {
+    "wprm-recipe-container": (
+        CSSSelector(".wprm-recipe-container"),
+        CSSSelector(".wprm-recipe-name"),
+        CSSSelector("li.wprm-recipe-ingredient"),
+        CSSSelector(".wprm-recipe-instruction-text"),
+    ),
+    "tasty-recipes": (
+        CSSSelector(".tasty-recipes"),
+        CSSSelector(".tasty-recipes-title"),
+        CSSSelector(".tasty-recipes-ingredients li"),
+        CSSSelector(".tasty-recipes-instructions li"),
+    ),
+    "mv-create-card": (
+        CSSSelector(".mv-create-card"),
+        CSSSelector(".mv-create-title"),
+        CSSSelector(".mv-create-ingredients li"),
+        CSSSelector(".mv-create-instructions li"),
+    ),
+}
+
+def _texts(els):
+    return [t for t in map(_node_text, els) if t]
+
+def extract_card_recipe(html, tree):
+    """
+    Recipe from a known plugin card, in the fallback's shape, or None when
+    no marker is present or the card has neither ingredients nor steps.
+    """
+    if tree is None or not isinstance(html, str):
+        return None
+    for marker in dict.fromkeys(m.group(0) for m in CARD_MARKER_RE.finditer(html)):
+        card_sel, title_sel, ingr_sel, steps_sel = CARD_TEMPLATES[marker]
+        cards = card_sel(tree)
+        if not cards:
+            continue  # e.g. only the plugin's stylesheet URL matched
+        card = cards[0]
+        ingredients = _texts(ingr_sel(card))
+        steps = _texts(steps_sel(card))
+        if not ingredients and not steps:
+            continue
+        title = title_sel(card)
+        labels = _scan_labels_for_times_and_serves(_node_text(card))
+        return {
+            "title": _node_text(title[0]) if title else "",
+            "ingredients": ingredients,
+            "steps": steps,
+            "prepTime": labels.get("prepTime"),
+            "cookTime": labels.get("cookTime"),
+            "recipeYield": labels.get("recipeYield"),
+        }
+    return None
+
+# ------------ Caches ------------
+# Final /extract payloads, keyed by canonical_url(). Recipe pages are
+# effectively immutable for the app, so an hour is safe.
+RESULT_CACHE = TTLCache(maxsize=2048, ttl=3600)
+# Raw pages + validators (ETag/Last-Modified), kept longer so an expired
+# result can be revalidated with a conditional GET. Bounded by total chars.
+HTML_CACHE = TTLCache(maxsize=64 * 1024 * 1024, ttl=6 * 3600, getsizeof=lambda e: len(e["html"]))
+# TTLCache is not thread-safe and the server runs threaded
+_CACHE_LOCK = threading.Lock()
+# hit/miss counters per cache, reported by /health (per worker process)
+CACHE_STATS = {id(c): {"hits": 0, "misses": 0} for c in (RESULT_CACHE, HTML_CACHE)}
+
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+def canonical_url(url):
+    """
+    Cache key for a recipe url: lowercase scheme/host, no fragment, no
+    tracking query params (utm_*, fbclid, ...).
+    """
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not k.lower().startswith(_TRACKING_PARAMS)]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(query), ""))
+
+def cache_get(cache, key):
+    with _CACHE_LOCK:
+        value = cache.get(key)
+        CACHE_STATS[id(cache)]["hits" if value is not None else "misses"] += 1
+        return value
+
+def cache_info(cache):
+    with _CACHE_LOCK:
+        # currsize/maxsize are in getsizeof units (entries, or chars for HTML_CACHE)
+        return {**CACHE_STATS[id(cache)], "entries": len(cache), "currsize": cache.currsize, "maxsize": cache.maxsize}
+
+def cache_set(cache, key, value):
+    with _CACHE_LOCK:
+        try:
+            cache[key] = value
+        except ValueError:  # single entry larger than the cache
+            pass
+
+def _remember_html(key, r, text):
+    cache_set(HTML_CACHE, key, {
+        "html": text,
+        "url": r.url,
+        "etag": r.headers.get("ETag"),
+        "last_modified": r.headers.get("Last-Modified"),
+    })
+
+# ------------ Size-capped body reads ------------
+# Decompressed bytes we are willing to read for one page; recipe pages are
+# well under this, anything bigger only stalls a worker and the heap.
+MAX_PAGE_BYTES = 2_000_000
+
+class PageTooLarge(Exception):
+    pass
+
+def _too_large(url):
+    return PageTooLarge(f"Page larger than {MAX_PAGE_BYTES} bytes: {url}")
+
+def _read_text(r):
+    """
+    Read a stream=True response up to MAX_PAGE_BYTES (after gzip/br
+    decoding) and decode it once, the way r.text would.
+    Raises PageTooLarge past the cap.
+    """
+    try:
+        length = r.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > MAX_PAGE_BYTES:
+            raise _too_large(r.url)
+        body = bytearray()
+        for chunk in r.iter_content(chunk_size=64 * 1024):
+            body += chunk
+            if len(body) > MAX_PAGE_BYTES:
+                raise _too_large(r.url)
+    finally:
+        r.close()
+    return _decode_body(body, r.encoding)
+
+def _decode_body(body, encoding):
+    # requests' r.text rules: header charset (ISO-8859-1 for bare text/*),
+    # else a chardet guess, else utf-8
+    if not body:
+        return ""
+    encoding = encoding or chardet.detect(bytes(body))["encoding"] or "utf-8"
+    try:
+        return body.decode(encoding, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+async def _read_text_async(r):
+    # aiohttp twin of _read_text
+    if r.content_length is not None and r.content_length > MAX_PAGE_BYTES:
+        raise _too_large(r.url)
+    body = bytearray()
+    async for chunk in r.content.iter_chunked(64 * 1024):
+        body += chunk
+        if len(body) > MAX_PAGE_BYTES:
+            raise _too_large(r.url)
+    # same charset rules as /extract, which shares RESULT_CACHE with us
+    return _decode_body(body, get_encoding_from_headers(r.headers))
+
+# ------------ Anti-bot aware fetcher ------------
+def fetch_html(url: str, cache_key=None):
     """
     Returns (html, final_url). Tries:
       1) requests with realistic headers
       2) cloudscraper (if installed)
       3) ScraperAPI (if SCRAPER_API_KEY env set)
-    Raises Exception if all fail.
+    With cache_key, a page cached in HTML_CACHE is revalidated with
+    If-None-Match/If-Modified-Since and reused on 304.
+    Raises PageTooLarge past MAX_PAGE_BYTES, Exception if all fail.
     """
     last_err = None
 
+    cached = cache_get(HTML_CACHE, cache_key) if cache_key else None
+    validators = {}
+    if cached:
+        if cached["etag"]:
+            validators["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            validators["If-Modified-Since"] = cached["last_modified"]
+
     # 1) requests
     try:
-        r = requests.get(url, headers=DEFAULT_HEADERS, timeout=25, allow_redirects=True)
-        if r.status_code < 400 and r.text:
-            return r.text, r.url
+        r = SESSION.get(url, headers=validators or None, timeout=(5, 25), allow_redirects=True, stream=True)
+        if r.status_code == 304 and cached:
+            r.close()
+            return cached["html"], cached["url"]
+        text = _read_text(r)
+        if r.status_code < 400 and text:
+            if cache_key:
+                _remember_html(cache_key, r, text)
+            return text, r.url
         if r.status_code not in (403, 429, 503):
-            body = (r.text or "")[:300]
-            raise Exception(f"HTTP {r.status_code}. Snippet: {body}")
+            raise Exception(f"HTTP {r.status_code}. Snippet: {text[:300]}")
     except requests.RequestException as e:
         last_err = f"requests error: {e}"
 
     # 2) cloudscraper
-    if cloudscraper is not None:
+    scraper = _cloudscraper()
+    if scraper is not None:
         try:
-            scraper = cloudscraper.create_scraper(browser={"browser": "chrome", "platform": "windows", "mobile": False})
-            r = scraper.get(url, headers=DEFAULT_HEADERS, timeout=35, allow_redirects=True)
+            # not streamed: cloudscraper reads the body to detect challenges
+            r = scraper.get(url, timeout=(5, 35), allow_redirects=True)
+            if len(r.content) > MAX_PAGE_BYTES:
+                raise _too_large(url)
             if r.status_code < 400 and r.text:
+                if cache_key:
+                    _remember_html(cache_key, r, r.text)
                 return r.text, r.url
             if r.status_code not in (403, 429, 503):
                 body = (r.text or "")[:300]
                 last_err = f"cloudscraper HTTP {r.status_code}. Snippet: {body}"
+        except PageTooLarge:
+            raise
         except Exception as e:
             last_err = f"cloudscraper error: {e}"
 
@@ -412,37 +975,169 @@ def fetch_html(url: str):
                 "country_code": os.environ.get("SCRAPER_COUNTRY", "au"),
                 # "render": "true",  # uncomment if you need JS rendering
             }
-            r = requests.get(proxy_url, params=params, headers=DEFAULT_HEADERS, timeout=60)
-            if r.status_code < 400 and r.text:
-                return r.text, url
-            body = (r.text or "")[:300]
-            last_err = f"ScraperAPI HTTP {r.status_code}. Snippet: {body}"
+            r = SESSION.get(proxy_url, params=params, timeout=(5, 60), stream=True)
+            text = _read_text(r)
+            if r.status_code < 400 and text:
+                return text, url
+            last_err = f"ScraperAPI HTTP {r.status_code}. Snippet: {text[:300]}"
+        except PageTooLarge:
+            raise
         except Exception as e:
             last_err = f"scraperapi error: {e}"
 
     raise Exception(f"Fetch failed for url: {url}. {last_err or ''}")
 
-# ------------ HTTP endpoint ------------
-@app.route("/extract", methods=["GET"])
-def extract():
-    url = request.args.get("url")
-    if not url:
-        return jsonify({"error": "Missing url parameter"}), 400
+# ------------ Async fetcher for batches ------------
+MAX_BATCH_URLS = 20
 
+async def fetch_html_async(session, url: str):
+    """
+    Async twin of fetch_html, same 3-tier fallback:
+      1) aiohttp with realistic headers
+      2) cloudscraper (if installed), run in the default executor
+      3) ScraperAPI via aiohttp (if SCRAPER_API_KEY env set)
+    Returns (html, final_url). Raises Exception if all fail.
+    """
+    last_err = None
+    loop = asyncio.get_running_loop()
+
+    # 1) aiohttp
     try:
-        html, final_url = fetch_html(url)
-    except Exception as e:
-        return jsonify({"error": f"Fetch failed: {e}"}), 502
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=25, sock_connect=5), allow_redirects=True) as r:
+            text = await _read_text_async(r)
+            if r.status < 400 and text:
+                return text, str(r.url)
+            if r.status not in (403, 429, 503):
+                raise Exception(f"HTTP {r.status}. Snippet: {text[:300]}")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        last_err = f"aiohttp error: {e}"
+
+    # 2) cloudscraper (sync, so keep it off the event loop; the scraper is
+    # looked up in the executor thread that uses it)
+    if cloudscraper is not None:
+        try:
+            r = await loop.run_in_executor(
+                None,
+                _cloudscraper_get, url,
+            )
+            if len(r.content) > MAX_PAGE_BYTES:
+                raise _too_large(url)
+            if r.status_code < 400 and r.text:
+                return r.text, r.url
+            if r.status_code not in (403, 429, 503):
+                body = (r.text or "")[:300]
+                last_err = f"cloudscraper HTTP {r.status_code}. Snippet: {body}"
+        except PageTooLarge:
+            raise
+        except Exception as e:
+            last_err = f"cloudscraper error: {e}"
+
+    # 3) ScraperAPI (optional)
+    key = os.environ.get("SCRAPER_API_KEY")
+    if key:
+        try:
+            params = {
+                "api_key": key,
+                "url": url,
+                "keep_headers": "true",
+                "country_code": os.environ.get("SCRAPER_COUNTRY", "au"),
+            }
+            async with session.get("https://api.scraperapi.com", params=params, timeout=aiohttp.ClientTimeout(total=60, sock_connect=5)) as r:
+                text = await _read_text_async(r)
+                if r.status < 400 and text:
+                    return text, url
+                last_err = f"ScraperAPI HTTP {r.status}. Snippet: {text[:300]}"
+        except PageTooLarge:
+            raise
+        except Exception as e:
+            last_err = f"scraperapi error: {e}"
+
+    raise Exception(f"Fetch failed for url: {url}. {last_err or ''}")
+
+async def _extract_many(urls):
+    """
+    Fetch all urls concurrently on one event loop, parse each page in the
+    default executor. Returns one result dict per url, in input order.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def one(session, url):
+        key = canonical_url(url)
+        hit = cache_get(RESULT_CACHE, key)
+        if hit is not None:
+            return hit
+        if session is not None:
+            html, final_url = await fetch_html_async(session, url)
+        else:
+            # aiohttp not installed: still overlap the blocking fetches in threads
+            html, final_url = await loop.run_in_executor(None, fetch_html, url, key)
+        result = await loop.run_in_executor(None, build_recipe, html, final_url)
+        cache_set(RESULT_CACHE, key, result)
+        return result
+
+    if aiohttp is not None:
+        connector = aiohttp.TCPConnector(limit=64, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS) as session:
+            results = await asyncio.gather(*[one(session, u) for u in urls], return_exceptions=True)
+    else:
+        results = await asyncio.gather(*[one(None, u) for u in urls], return_exceptions=True)
+
+    out = []
+    for url, res in zip(urls, results):
+        if isinstance(res, Exception):
+            out.append({"url": url, "error": f"Fetch failed: {res}"})
+        else:
+            out.append({"url": url, **res})
+    return out
 
-    # Try schema.org first
+# ------------ HTTP endpoint ------------
+# Runs the HTML heuristics alongside extruct when the quick JSON-LD scan
+# comes up empty, so a schema miss doesn't pay for both passes in series.
+# Both only read the shared tree.
+FALLBACK_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fallback")
+
+def build_recipe(html, final_url):
+    """
+    Run the extraction pipeline on fetched html and return the response
+    shape the iOS app expects.
+    """
+    # Try schema.org first: ld+json straight from the markup, then extruct
+    # on one lxml parse that the fallback reuses. When the quick scan read
+    # the same blocks extruct would, they are not decoded again and
+    # extruct only adds microdata.
+    tree = None
+    fallback = None
     try:
-        data = extract_schema_recipe(html, final_url)
+        node, scanned = scan_jsonld(html)
+        data = _recipe_from_node(node) if node is not None else None
     except Exception:
-        data = None
+        node, scanned, data = None, None, None
+    if node is None:
+        tree = parse_tree(html)
+        fallback = FALLBACK_POOL.submit(extract_html_fallback, html, tree)
+        try:
+            covered = jsonld_scan_covers(tree, scanned)
+            syntaxes = ("microdata",) if covered else ("json-ld", "microdata")
+            data = extract_schema_recipe(html, final_url, tree=tree, syntaxes=syntaxes)
+        except Exception:
+            data = None
+
+    # schema.org wins, from either path; a known plugin card beats the
+    # generic heuristics
+    if not data or (not data.get("ingredients") and not data.get("steps")):
+        if tree is None:
+            tree = parse_tree(html)
+        data = extract_card_recipe(html, tree) or data
 
-    # Fallback to HTML heuristics
+    # Fallback to HTML heuristics; if the speculative run never got a
+    # worker, do it here rather than wait in the queue
     if not data or (not data.get("ingredients") and not data.get("steps")):
-        data = extract_html_fallback(html)
+        if fallback is not None and not fallback.cancel():
+            data = fallback.result()
+        else:
+            data = extract_html_fallback(html, tree=tree)
+    elif fallback is not None:
+        fallback.cancel()
 
     # Final safety: derive cook from steps if still missing
     if not data.get("cookTime") and data.get("steps"):
@@ -451,7 +1146,7 @@ def extract():
             data["cookTime"] = derived
 
     # Guarantee the shape the iOS app expects
-    safe = {
+    return {
         "title": data.get("title", "") or "",
         "ingredients": data.get("ingredients") or [],
         "steps": data.get("steps") or [],
@@ -461,11 +1156,51 @@ def extract():
         "recipeYield": data.get("recipeYield") or None,
         # "nutrition": {...}  # can be added later
     }
-    return jsonify(safe)
+
+@app.route("/extract", methods=["GET"])
+def extract():
+    url = request.args.get("url")
+    if not url:
+        return jsonify({"error": "Missing url parameter"}), 400
+
+    try:
+        key = canonical_url(url)
+    except ValueError as e:  # e.g. "Invalid IPv6 URL" from urlsplit
+        return jsonify({"error": f"Invalid url: {e}"}), 400
+    hit = cache_get(RESULT_CACHE, key)
+    if hit is not None:
+        return jsonify(hit)
+
+    try:
+        html, final_url = fetch_html(url, cache_key=key)
+    except PageTooLarge as e:
+        return jsonify({"error": str(e)}), 413
+    except Exception as e:
+        return jsonify({"error": f"Fetch failed: {e}"}), 502
+
+    result = build_recipe(html, final_url)
+    cache_set(RESULT_CACHE, key, result)
+    return jsonify(result)
+
+@app.route("/extract_many", methods=["GET"])
+def extract_many():
+    # accepts ?urls=a,b,c and/or repeated ?url=a&url=b
+    urls = request.args.getlist("url")
+    for chunk in request.args.getlist("urls"):
+        urls.extend(u.strip() for u in chunk.split(",") if u.strip())
+    if not urls:
+        return jsonify({"error": "Missing urls parameter"}), 400
+    if len(urls) > MAX_BATCH_URLS:
+        return jsonify({"error": f"Too many urls (max {MAX_BATCH_URLS})"}), 400
+
+    return jsonify({"results": asyncio.run(_extract_many(urls))})
 
 @app.route("/health")
 def health():
-    return {"ok": True}
+    return {
+        "ok": True,
+        "cache": {"results": cache_info(RESULT_CACHE), "html": cache_info(HTML_CACHE)},
+    }
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 10000))
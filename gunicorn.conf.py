@@ -0,0 +1,14 @@
+# gunicorn.conf.py — picked up by `gunicorn app:app` (see Procfile)
+import multiprocessing, os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
+# /extract is I/O-bound (upstream fetches), so a few processes with many
+# threads each
+worker_class = "gthread"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.environ.get("GUNICORN_THREADS", 16))
+timeout = 60
+# Import app.py (extruct, lxml, compiled regexes/XPaths) once in the master
+# and share it copy-on-write. Nothing at import opens a socket or starts a
+# thread, so each worker still builds its own connection and fallback pools.
+preload_app = True
@@ -0,0 +1,41 @@
+# Pages whose ld+json Recipe the quick regex scan misses but extruct's XPath
+# finds; build_recipe must still return the schema.org recipe for each.
+# Run with: python -m unittest discover tests
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+RECIPE = (
+    '{"@context":"https://schema.org","@type":"Recipe","name":"Brownies",'
+    '"recipeIngredient":["1 cup sugar","2 eggs"],'
+    '"recipeInstructions":[{"@type":"HowToStep","text":"Bake."}]}'
+)
+SCRIPT = '<script type="application/ld+json">' + RECIPE + "</script>"
+
+def page(head):
+    return f"<html><head><title>Blog</title>{head}</head><body><h1>Blog</h1></body></html>"
+
+PAGES = {
+    "meta_script_opener": page('<meta name="x" content="<script>">' + SCRIPT),
+    "meta_comment_opener": page('<meta name="x" content="<!-- ">' + SCRIPT),
+    "gt_in_attribute": page(
+        '<script data-x="a>b" type="application/ld+json">' + RECIPE + "</script>"
+    ),
+    "empty_comment": page("<!-->" + SCRIPT),
+}
+
+class ScanMissFallsBackToExtruct(unittest.TestCase):
+    def test_recipe_survives_scan_miss(self):
+        for name, html in PAGES.items():
+            with self.subTest(page=name):
+                out = app.build_recipe(html, "https://example.com/r")
+                self.assertEqual(out["title"], "Brownies")
+                self.assertEqual(out["ingredients"], ["1 cup sugar", "2 eggs"])
+                self.assertEqual(out["steps"], ["Bake."])
+
+if __name__ == "__main__":
+    unittest.main()